@@ -6,13 +6,24 @@ import os
 import signal
 import sys
 import json
+import threading
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
+from http.client import HTTPSConnection, HTTPException
+from urllib.parse import urlsplit
 
 import apprise
 
+try:
+    from orjson import loads as json_loads  # optional, faster decoding of large responses
+except ImportError:
+    json_loads = json.loads
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -28,27 +39,201 @@ SCHEDULE = os.environ.get("SCHEDULE", "")  # e.g. "08:00" for daily at 8am, "6h"
 UPDATE_SCHEDULE = os.environ.get("UPDATE_SCHEDULE", "")  # when to send routine balance update notifications
 UPDATE_APPRISE_URLS = os.environ.get("UPDATE_APPRISE_URLS", "")  # defaults to APPRISE_URLS if empty
 TZ = os.environ.get("TZ", "")
+CACHE_DIR = os.path.expanduser(os.environ.get("CACHE_DIR", "~/.cache/ynab-monitor"))  # empty = no on-disk cache
 
 YNAB_BASE = "https://api.ynab.com/v1"
+MAX_MONITOR_DAYS = 3650  # bounds recurrence expansion (a daily txn yields one occurrence per day)
 
 # ---------------------------------------------------------------------------
 # YNAB API helpers
 # ---------------------------------------------------------------------------
 
+_YNAB_URL = urlsplit(YNAB_BASE)
+_YNAB_POOL = ThreadPoolExecutor(max_workers=3)  # one per endpoint fetched by run_check
+
+
 def ynab_get(path):
-    """Make an authenticated GET request to the YNAB API."""
-    url = f"{YNAB_BASE}{path}"
-    req = Request(url, headers={"Authorization": f"Bearer {YNAB_API_TOKEN}"})
+    """Make an authenticated GET request to the YNAB API.
+
+    Each request uses its own connection, closed once the response is read:
+    the fetches of a check cycle run concurrently on separate threads, and a
+    connection idle until the next scheduled run would be closed by then.
+    """
+    url = f"{_YNAB_URL.path}{path}"
+    headers = {"Authorization": f"Bearer {YNAB_API_TOKEN}"}
+    conn = HTTPSConnection(_YNAB_URL.netloc, timeout=30)
     try:
-        with urlopen(req) as resp:
-            return json.loads(resp.read().decode())["data"]
-    except HTTPError as e:
-        body = e.read().decode()
-        print(f"YNAB API error ({e.code}): {body}", file=sys.stderr)
+        conn.request("GET", url, headers=headers)
+        resp = conn.getresponse()
+        body = resp.read()
+    except (HTTPException, OSError) as e:
+        print(f"Network error: {e}", file=sys.stderr)
         sys.exit(1)
-    except URLError as e:
-        print(f"Network error: {e.reason}", file=sys.stderr)
+    finally:
+        conn.close()
+
+    if resp.status != 200:
+        print(f"YNAB API error ({resp.status}): {body.decode()}", file=sys.stderr)
         sys.exit(1)
+    return json_loads(body)["data"]
+
+
+# Endpoints that support delta requests (last_knowledge_of_server), keyed by
+# their last path segment and mapped to the entity list they return.
+_DELTA_ENDPOINTS = {
+    "accounts": "accounts",
+    "categories": "category_groups",
+    "scheduled_transactions": "scheduled_transactions",
+}
+_DELTA_CACHE = {}  # path -> (server_knowledge, merged data, time of last full fetch)
+_DELTA_MAX_AGE = 24 * 3600  # seconds; older cache entries are refetched in full
+
+# Fields of a scheduled transaction that get_scheduled_transactions reads.
+_SCHEDULED_FIELDS = (
+    "id", "account_id", "date_first", "date_next", "frequency",
+    "amount", "payee_name", "transfer_account_id",
+)
+
+
+def _slim_scheduled_transactions(txns):
+    """Reduce scheduled transactions to the monitored account's, with only the fields we use.
+
+    A budget's scheduled transactions span every account and carry memos,
+    flags and subtransactions, none of which the projection needs. Slimming
+    them before they are cached keeps the resident copy small across ticks.
+    Deleted transactions are dropped; a delta that moves a transaction to
+    another account replaces it by id and is then dropped here too.
+    """
+    return [
+        {f: t[f] for f in _SCHEDULED_FIELDS if f in t}
+        for t in txns
+        if t["account_id"] == YNAB_ACCOUNT_ID and not t.get("deleted", False)
+    ]
+
+
+# Post-processing applied to a delta endpoint's entity list before caching.
+_DELTA_SLIM = {
+    "scheduled_transactions": _slim_scheduled_transactions,
+}
+
+# Delta cache entries persisted under CACHE_DIR, so runs in separate processes
+# (run-once mode under cron, container restarts) still get delta requests.
+_DELTA_FILES = {
+    "accounts": "accounts.json",
+    "category_groups": "categories.json",
+    "scheduled_transactions": "scheduled.json",
+}
+
+
+def _delta_cache_file(key):
+    """Path of the on-disk cache for a delta entity list, or None if not persisted."""
+    if not CACHE_DIR or key not in _DELTA_FILES:
+        return None
+    return os.path.join(CACHE_DIR, _DELTA_FILES[key])
+
+
+def _load_delta_cache(path, key):
+    """Load a persisted (server_knowledge, data, refreshed_at) entry for path, or None."""
+    filename = _delta_cache_file(key)
+    if filename is None:
+        return None
+    try:
+        with open(filename) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # A different budget invalidates an entry, as does a different account
+    # (scheduled transactions are slimmed to the monitored account).
+    if saved.get("path") != path or saved.get("account_id") != YNAB_ACCOUNT_ID:
+        return None
+    if "refreshed_at" not in saved:
+        return None
+    return saved["server_knowledge"], saved["data"], saved["refreshed_at"]
+
+
+def _save_delta_cache(path, key, knowledge, data, refreshed_at):
+    """Persist a delta cache entry; failures are reported but not fatal."""
+    filename = _delta_cache_file(key)
+    if filename is None:
+        return
+    saved = {
+        "path": path,
+        "account_id": YNAB_ACCOUNT_ID,
+        "server_knowledge": knowledge,
+        "refreshed_at": refreshed_at,
+        "data": data,
+    }
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(f"{filename}.tmp", "w") as f:
+            json.dump(saved, f)
+        os.replace(f"{filename}.tmp", filename)
+    except OSError as e:
+        print(f"Warning: could not write cache {filename}: {e}", file=sys.stderr)
+
+
+def _merge_by_id(entities, changes):
+    """Merge delta-request changes into a cached entity list, matching on id.
+
+    Deleted entities come back with deleted=True and are kept as such. Category
+    groups only carry their changed categories, so those are merged in turn.
+    """
+    merged = {e["id"]: e for e in entities}
+    for change in changes:
+        prev = merged.get(change["id"])
+        if prev is not None and "categories" in change:
+            change = {**change, "categories": _merge_by_id(prev["categories"], change["categories"])}
+        merged[change["id"]] = change
+    return list(merged.values())
+
+
+def ynab_get_delta(path):
+    """GET a delta-capable YNAB endpoint, reusing the result of the last call.
+
+    The first call fetches everything; later calls (on subsequent scheduled
+    runs) pass last_knowledge_of_server so YNAB only returns entities that
+    changed since, which are merged into the cached copy. Entries listed in
+    _DELTA_FILES also survive restarts via CACHE_DIR. Once an entry is older
+    than _DELTA_MAX_AGE it is refetched in full, so a cache that has drifted
+    from the server cannot persist indefinitely.
+    """
+    key = _DELTA_ENDPOINTS[path.rsplit("/", 1)[-1]]
+    cached = _DELTA_CACHE.get(path) or _load_delta_cache(path, key)
+    if cached is None or time.time() - cached[2] > _DELTA_MAX_AGE:
+        data = ynab_get(path)
+        refreshed_at = time.time()
+    else:
+        knowledge, prev, refreshed_at = cached
+        data = ynab_get(f"{path}?last_knowledge_of_server={knowledge}")
+        data = {**data, key: _merge_by_id(prev[key], data[key])}
+    if key in _DELTA_SLIM:
+        data[key] = _DELTA_SLIM[key](data[key])
+    entry = (data["server_knowledge"], data, refreshed_at)
+    _DELTA_CACHE[path] = entry
+    if cached is None or cached[0] != entry[0] or cached[2] != entry[2]:
+        _save_delta_cache(path, key, *entry)
+    return data
+
+
+def _ynab_fetch(path):
+    """GET a YNAB endpoint, using a delta request where the endpoint supports it.
+
+    Delta caching needs an explicit YNAB_BUDGET_ID: "last-used" can resolve
+    to a different budget between runs, whose changes would then be merged
+    into the previous budget's cached data.
+    """
+    if YNAB_BUDGET_ID != "last-used" and path.rsplit("/", 1)[-1] in _DELTA_ENDPOINTS:
+        return ynab_get_delta(path)
+    return ynab_get(path)
+
+
+def ynab_get_many(*paths):
+    """Fetch several YNAB endpoints concurrently, returning their data in order.
+
+    The requests are independent, so a cycle costs roughly one round trip
+    instead of one per endpoint.
+    """
+    return list(_YNAB_POOL.map(_ynab_fetch, paths))
 
 
 def milliunits_to_dollars(milliunits):
@@ -60,26 +245,41 @@ def milliunits_to_dollars(milliunits):
 # Core logic
 # ---------------------------------------------------------------------------
 
-def get_end_date():
+# One expanded occurrence of a scheduled transaction (amount in milliunits).
+Txn = namedtuple("Txn", "date amount transfer_account_id label")
+
+
+@lru_cache(maxsize=128)
+def _days_in_month(year, month):
+    """Number of days in a month; memoized since recurrence expansion asks repeatedly."""
+    return calendar.monthrange(year, month)[1]
+
+
+def get_end_date(today):
     """Compute the projection end date.
 
     If MONITOR_DAYS is set, project that many days forward.
     Otherwise, project through the end of the current month.
     """
-    today = datetime.now().date()
     if MONITOR_DAYS:
         return today + timedelta(days=int(MONITOR_DAYS))
-    last_day = calendar.monthrange(today.year, today.month)[1]
+    last_day = _days_in_month(today.year, today.month)
     return date(today.year, today.month, last_day)
 
 
-def get_account_balance():
-    """Get the current balance of the monitored account."""
-    data = ynab_get(f"/budgets/{YNAB_BUDGET_ID}/accounts/{YNAB_ACCOUNT_ID}")
-    account = data["account"]
-    balance = milliunits_to_dollars(account["balance"])
+def get_account_balance(accounts_data):
+    """Get the current balance of the monitored account.
+
+    Reads it from the /accounts list (also needed for the CC account mapping)
+    rather than a separate /accounts/{id} request.
+    """
+    account = next((a for a in accounts_data["accounts"] if a["id"] == YNAB_ACCOUNT_ID), None)
+    if account is None:
+        print(f"YNAB account not found: {YNAB_ACCOUNT_ID}", file=sys.stderr)
+        sys.exit(1)
+    balance = account["balance"]
     print(f"Account: {account['name']}")
-    print(f"Current balance: ${balance:,.2f}")
+    print(f"Current balance: ${milliunits_to_dollars(balance):,.2f}")
     return balance
 
 
@@ -88,10 +288,31 @@ def _add_months(d, months):
     month = d.month - 1 + months
     year = d.year + month // 12
     month = month % 12 + 1
-    day = min(d.day, calendar.monthrange(year, month)[1])
+    day = min(d.day, _days_in_month(year, month))
     return date(year, month, day)
 
 
+# YNAB frequencies with a fixed step in days; their occurrences are computed
+# arithmetically rather than stepped through one at a time.
+_FIXED_DAYS = {
+    "daily":          1,
+    "weekly":         7,
+    "everyOtherWeek": 14,
+    "every4Weeks":    28,
+}
+
+# YNAB frequencies with a fixed step in months.
+_FIXED_MONTHS = {
+    "monthly":         1,
+    "everyOtherMonth": 2,
+    "every3Months":    3,
+    "every4Months":    4,
+    "twiceAYear":      6,
+    "yearly":          12,
+    "everyOtherYear":  24,
+}
+
+
 def _expand_occurrences(next_date, frequency, start, end):
     """Generate all occurrence dates of a recurring transaction within [start, end].
 
@@ -99,200 +320,191 @@ def _expand_occurrences(next_date, frequency, start, end):
     frequency:  YNAB frequency string
     start/end:  the monitoring window bounds
     """
-    # Map YNAB frequency to a delta-generating function.
-    # Each function returns the next date given the current one.
-    DELTAS = {
-        "daily":          lambda d: d + timedelta(days=1),
-        "weekly":         lambda d: d + timedelta(weeks=1),
-        "everyOtherWeek": lambda d: d + timedelta(weeks=2),
-        "every4Weeks":    lambda d: d + timedelta(weeks=4),
-        "monthly":        lambda d: _add_months(d, 1),
-        "everyOtherMonth":lambda d: _add_months(d, 2),
-        "every3Months":   lambda d: _add_months(d, 3),
-        "every4Months":   lambda d: _add_months(d, 4),
-        "twiceAMonth":    None,  # special case
-        "twiceAYear":     lambda d: _add_months(d, 6),
-        "yearly":         lambda d: _add_months(d, 12),
-        "everyOtherYear": lambda d: _add_months(d, 24),
-    }
-
-    if frequency == "never" or frequency not in DELTAS:
-        # One-time transaction — just return it if in range
-        if start <= next_date <= end:
-            return [next_date]
-        return []
+    step = _FIXED_DAYS.get(frequency)
+    if step is not None:
+        # Skip whole steps up to start, then count the steps that fit before end
+        skip = max(0, -(-(start - next_date).days // step))
+        first = next_date + timedelta(days=skip * step)
+        if first > end:
+            return []
+        count = (end - first).days // step + 1
+        return [first + timedelta(days=step * i) for i in range(count)]
+
+    step = _FIXED_MONTHS.get(frequency)
+    if step is not None:
+        # Every occurrence is offset from next_date itself (not chained from
+        # the previous one), so a day clamped in a short month (e.g. the 31st
+        # in February) is restored in the following months.
+        months = (end.year - next_date.year) * 12 + end.month - next_date.month
+        dates = [_add_months(next_date, step * i) for i in range(months // step + 1)]
+        return [d for d in dates if start <= d <= end]
 
     # Special handling for twiceAMonth: YNAB schedules on the 1st & 15th
     # (or the original day and that day + ~15). We approximate by using
     # the next_date's day-of-month and that day ± 15.
     if frequency == "twiceAMonth":
         dates = []
-        # Generate monthly anchors, then add both the "first" and "second" hit
         day1 = next_date.day
         day2 = day1 + 15 if day1 <= 15 else day1 - 15
-        d = next_date.replace(day=1)  # start of month
-        # Back up one month to make sure we don't miss anything
-        d = _add_months(d, -1)
-        month_end = end
-        while d <= month_end:
-            last_day = calendar.monthrange(d.year, d.month)[1]
-            for target_day in (day1, day2):
-                clamped = min(target_day, last_day)
-                candidate = date(d.year, d.month, clamped)
-                if start <= candidate <= end:
+        # Walk the months from the first one that can hold an occurrence,
+        # emitting the earlier hit before the later so the result is sorted.
+        first = max(next_date, start)
+        d = first.replace(day=1)
+        while d <= end:
+            last_day = _days_in_month(d.year, d.month)
+            for target_day in (min(day1, day2), max(day1, day2)):
+                candidate = date(d.year, d.month, min(target_day, last_day))
+                if first <= candidate <= end:
                     dates.append(candidate)
             d = _add_months(d, 1)
-        return sorted(set(dates))
+        return dates
 
-    # General case: walk forward from next_date using the delta function
-    advance = DELTAS[frequency]
-    dates = []
-    d = next_date
-    while d <= end:
-        if d >= start:
-            dates.append(d)
-        d = advance(d)
-    return dates
+    # One-time transaction ("never", or a frequency we don't know) — just
+    # return it if in range
+    if start <= next_date <= end:
+        return [next_date]
+    return []
 
 
-def get_scheduled_transactions(end_date):
+def get_scheduled_transactions(data, today, end_date):
     """Get all scheduled transactions for the monitored account.
 
-    Expands recurring transactions into individual occurrences within the
-    monitoring window.
+    data is the /scheduled_transactions response. Expands recurring
+    transactions into individual occurrences within the monitoring window,
+    returned as date-sorted Txn tuples.
     """
-    data = ynab_get(f"/budgets/{YNAB_BUDGET_ID}/scheduled_transactions")
-    today = datetime.now().date()
+    account_id = YNAB_ACCOUNT_ID
+    fromiso = date.fromisoformat
+    expand = _expand_occurrences
 
-    transactions = []
-    for txn in data["scheduled_transactions"]:
-        if txn["account_id"] != YNAB_ACCOUNT_ID:
-            continue
-        if txn.get("deleted", False):
-            continue
+    # Filter to the monitored account first; most scheduled transactions in a
+    # budget belong to other accounts and need no further work.
+    ours = [
+        t for t in data["scheduled_transactions"]
+        if t["account_id"] == account_id and not t.get("deleted", False)
+    ]
 
-        next_date = datetime.strptime(txn.get("date_next") or txn.get("date_first", ""), "%Y-%m-%d").date()
+    transactions = []
+    for txn in ours:
+        next_date = fromiso(txn.get("date_next") or txn.get("date_first", ""))
         frequency = txn.get("frequency", "never")
-        amount = milliunits_to_dollars(txn["amount"])
+        amount = txn["amount"]
         payee = txn.get("payee_name", "Unknown")
         transfer_account_id = txn.get("transfer_account_id")
+        freq_label = f" ({frequency})" if frequency != "never" else ""
+        label = f"{payee}{freq_label}"
 
-        occurrences = _expand_occurrences(next_date, frequency, today, end_date)
-        for occ_date in occurrences:
-            freq_label = f" ({frequency})" if frequency != "never" else ""
-            transactions.append({
-                "date": occ_date,
-                "amount": amount,
-                "payee": payee,
-                "transfer_account_id": transfer_account_id,
-                "frequency": frequency,
-                "label": f"{payee}{freq_label}",
-            })
-
-    transactions.sort(key=lambda t: t["date"])
+        transactions.extend(
+            Txn(occ_date, amount, transfer_account_id, label)
+            for occ_date in expand(next_date, frequency, today, end_date)
+        )
+
+    transactions.sort(key=attrgetter("date"))
     print(f"\nScheduled transactions through {end_date}: {len(transactions)}")
-    for t in transactions:
-        print(f"  {t['date']}  {t['label']:40s}  ${t['amount']:>10,.2f}")
+    # One write for the whole listing rather than one per occurrence
+    if transactions:
+        print("\n".join(
+            f"  {t.date}  {t.label:40s}  ${milliunits_to_dollars(t.amount):>10,.2f}"
+            for t in transactions
+        ))
     return transactions
 
 
-def get_cc_payment_amounts():
+def get_cc_payment_amounts(accounts_data, categories_data):
     """Get credit card payment category available balances.
 
+    accounts_data and categories_data are the /accounts and /categories
+    responses.
+
     Returns a dict of {account_id: available_amount} for credit card accounts,
-    and the total amount to be paid.
+    and the total amount to be paid. Amounts are in milliunits.
     """
-    # Get all accounts to identify credit card accounts and map category names
-    accounts_data = ynab_get(f"/budgets/{YNAB_BUDGET_ID}/accounts")
-    cc_accounts = {}
-    for acct in accounts_data["accounts"]:
-        if acct["type"] == "creditCard" and not acct.get("deleted", False) and not acct.get("closed", False):
-            cc_accounts[acct["name"]] = acct["id"]
-
-    # Get categories and find the Credit Card Payments group
-    categories_data = ynab_get(f"/budgets/{YNAB_BUDGET_ID}/categories")
+    # Map CC payment category names (which match their account's name) to
+    # open credit card account IDs
+    cc_accounts = {
+        acct["name"]: acct["id"]
+        for acct in accounts_data["accounts"]
+        if acct["type"] == "creditCard" and not acct.get("deleted", False) and not acct.get("closed", False)
+    }
 
     # Parse user-specified CC categories filter
-    cc_filter = set()
+    cc_filter = frozenset()
     if YNAB_CC_CATEGORIES:
-        cc_filter = {c.strip() for c in YNAB_CC_CATEGORIES.split(",")}
+        cc_filter = frozenset(c.strip() for c in YNAB_CC_CATEGORIES.split(","))
+
+    # Only the Credit Card Payments group matters; stop at the first match
+    cc_group = next(
+        (g for g in categories_data["category_groups"] if g["name"] == "Credit Card Payments"),
+        None,
+    )
+    cc_categories = cc_group["categories"] if cc_group else []
 
     cc_payments = {}
-    for group in categories_data["category_groups"]:
-        if group["name"] != "Credit Card Payments":
+    for cat in cc_categories:
+        if cat.get("deleted", False) or cat.get("hidden", False):
+            continue
+        # If user specified specific categories, filter
+        if cc_filter and cat["id"] not in cc_filter and cat["name"] not in cc_filter:
             continue
-        for cat in group["categories"]:
-            if cat.get("deleted", False) or cat.get("hidden", False):
-                continue
-            # If user specified specific categories, filter
-            if cc_filter and cat["id"] not in cc_filter and cat["name"] not in cc_filter:
-                continue
-
-            available = milliunits_to_dollars(cat["balance"])
-            # Map category name back to account ID
-            account_id = cc_accounts.get(cat["name"])
-            if account_id and available > 0:
-                cc_payments[account_id] = {
-                    "name": cat["name"],
-                    "amount": available,
-                }
+
+        available = cat["balance"]
+        account_id = cc_accounts.get(cat["name"])
+        if account_id and available > 0:
+            cc_payments[account_id] = {
+                "name": cat["name"],
+                "amount": available,
+            }
 
     total = sum(p["amount"] for p in cc_payments.values())
-    print(f"\nCredit card payments to account for: ${total:,.2f}")
-    for p in cc_payments.values():
-        print(f"  {p['name']:30s}  ${p['amount']:>10,.2f}")
+    print(f"\nCredit card payments to account for: ${milliunits_to_dollars(total):,.2f}")
+    if cc_payments:
+        print("\n".join(
+            f"  {p['name']:30s}  ${milliunits_to_dollars(p['amount']):>10,.2f}"
+            for p in cc_payments.values()
+        ))
     return cc_payments, total
 
 
-def project_minimum_balance(current_balance, scheduled_transactions, cc_payments, end_date):
-    """Walk day-by-day to find the minimum projected balance.
+def project_minimum_balance(current_balance, scheduled_transactions, cc_payments, today):
+    """Sweep the scheduled transactions to find the minimum projected balance.
+
+    scheduled_transactions are the date-sorted Txn tuples from
+    get_scheduled_transactions. Since the balance only changes on transaction
+    days, only those days are visited. All amounts are integer milliunits, so
+    the running balance is exact.
 
     CC payments that are already in scheduled_transactions (as transfers to CC
     accounts) are not double-counted. Any remaining CC payment amounts are
     applied on day 1 (conservative: assumes they could hit at any time).
     """
-    today = datetime.now().date()
-
     # Identify which CC payments are already covered by scheduled transfers
-    remaining_cc = dict(cc_payments)  # shallow copy of outer dict
+    remaining_cc = {account_id: p["amount"] for account_id, p in cc_payments.items()}
     for txn in scheduled_transactions:
-        transfer_id = txn["transfer_account_id"]
+        transfer_id = txn.transfer_account_id
         if transfer_id and transfer_id in remaining_cc:
             # This scheduled transaction already covers (part of) the CC payment
-            covered = min(remaining_cc[transfer_id]["amount"], abs(txn["amount"]))
-            remaining_cc[transfer_id] = {
-                **remaining_cc[transfer_id],
-                "amount": remaining_cc[transfer_id]["amount"] - covered,
-            }
-            if remaining_cc[transfer_id]["amount"] <= 0.005:
+            remaining_cc[transfer_id] -= min(remaining_cc[transfer_id], abs(txn.amount))
+            if remaining_cc[transfer_id] <= 0:
                 del remaining_cc[transfer_id]
 
     # Unscheduled CC payment total — apply on day 1
-    unscheduled_cc_total = sum(p["amount"] for p in remaining_cc.values())
+    unscheduled_cc_total = sum(remaining_cc.values())
     if unscheduled_cc_total > 0:
-        print(f"\nUnscheduled CC payments (applied today): ${unscheduled_cc_total:,.2f}")
+        print(f"\nUnscheduled CC payments (applied today): ${milliunits_to_dollars(unscheduled_cc_total):,.2f}")
 
-    # Build day-by-day projection
     balance = current_balance - unscheduled_cc_total
     min_balance = balance
     min_date = today
 
-    # Group scheduled transactions by date
-    txn_by_date = {}
-    for txn in scheduled_transactions:
-        txn_by_date.setdefault(txn["date"], []).append(txn)
-
-    day = today
-    while day <= end_date:
-        if day in txn_by_date:
-            for txn in txn_by_date[day]:
-                balance += txn["amount"]
+    # Same-day transactions are folded together so the minimum is measured at
+    # end of day.
+    for day, txns in groupby(scheduled_transactions, key=attrgetter("date")):
+        balance += sum(txn.amount for txn in txns)
         if balance < min_balance:
             min_balance = balance
             min_date = day
-        day += timedelta(days=1)
 
-    print(f"\nProjected minimum balance: ${min_balance:,.2f} on {min_date}")
+    print(f"\nProjected minimum balance: ${milliunits_to_dollars(min_balance):,.2f} on {min_date}")
     return min_balance, min_date
 
 
@@ -310,8 +522,8 @@ def _build_notifier(urls_str):
     return notifier
 
 
-def send_alert_notification(min_balance, min_date):
-    """Send a below-threshold alert via Apprise."""
+def send_alert_notification(notifier, min_balance, min_date):
+    """Send a below-threshold alert via the given Apprise notifier."""
     title = "YNAB Balance Alert"
     message = (
         f"Your checking account balance is projected to drop to "
@@ -319,7 +531,6 @@ def send_alert_notification(min_balance, min_date):
         f"Minimum threshold: ${MIN_BALANCE:,.2f}."
     )
 
-    notifier = _build_notifier(APPRISE_URLS)
     notify_type = apprise.NotifyType.WARNING if min_balance < 0 else apprise.NotifyType.INFO
 
     if not notifier.notify(title=title, body=message, notify_type=notify_type):
@@ -329,8 +540,8 @@ def send_alert_notification(min_balance, min_date):
     print("\nAlert notification sent via Apprise")
 
 
-def send_update_notification(min_balance, min_date, end_date):
-    """Send a routine projected-balance update via Apprise."""
+def send_update_notification(notifier, min_balance, min_date, end_date):
+    """Send a routine projected-balance update via the given Apprise notifier."""
     title = "YNAB Balance Update"
     status = "below threshold" if min_balance < MIN_BALANCE else "on track"
     message = (
@@ -339,8 +550,6 @@ def send_update_notification(min_balance, min_date, end_date):
         f"Threshold: ${MIN_BALANCE:,.2f} — {status}."
     )
 
-    urls = UPDATE_APPRISE_URLS or APPRISE_URLS
-    notifier = _build_notifier(urls)
     notify_type = apprise.NotifyType.WARNING if min_balance < MIN_BALANCE else apprise.NotifyType.SUCCESS
 
     if not notifier.notify(title=title, body=message, notify_type=notify_type):
@@ -354,7 +563,7 @@ def send_update_notification(min_balance, min_date, end_date):
 # ---------------------------------------------------------------------------
 
 def validate_config():
-    """Check required configuration is present."""
+    """Check required configuration is present and sane."""
     errors = []
     if not YNAB_API_TOKEN:
         errors.append("YNAB_API_TOKEN is required")
@@ -362,40 +571,57 @@ def validate_config():
         errors.append("YNAB_ACCOUNT_ID is required")
     if not APPRISE_URLS:
         errors.append("APPRISE_URLS is required")
+    if MONITOR_DAYS and not (MONITOR_DAYS.isdigit() and int(MONITOR_DAYS) <= MAX_MONITOR_DAYS):
+        errors.append(f"MONITOR_DAYS must be a whole number of days up to {MAX_MONITOR_DAYS}")
     if errors:
         for e in errors:
             print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def run_check(send_update=False):
+def run_check(alert_notifier, update_notifier, send_update=False):
     """Run one balance check cycle.
 
     Always evaluates the alert threshold and fires an alert notification if
     the projected minimum falls below MIN_BALANCE.  When send_update is True,
     also fires a routine update notification regardless of the threshold.
+    Notifications go through the prebuilt alert_notifier / update_notifier.
     """
-    end_date = get_end_date()
+    # Read the clock once so every step of the cycle agrees on "today", even
+    # when a run straddles midnight. The [today, end_date] window is computed
+    # here only: the scheduled-transaction expansion, the projection (via the
+    # expanded transactions) and the update notification all share it.
+    now = datetime.now()
+    today = now.date()
+    end_date = get_end_date(today)
 
     print("=" * 60)
-    print(f"YNAB Balance Monitor — {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    print(f"YNAB Balance Monitor — {now.strftime('%Y-%m-%d %H:%M')}")
     print(f"Projecting through {end_date}, threshold: ${MIN_BALANCE:,.2f}")
     print("=" * 60)
 
-    balance = get_account_balance()
-    transactions = get_scheduled_transactions(end_date)
-    cc_payments, cc_total = get_cc_payment_amounts()
-    min_balance, min_date = project_minimum_balance(balance, transactions, cc_payments, end_date)
+    accounts_data, scheduled_data, categories_data = ynab_get_many(
+        f"/budgets/{YNAB_BUDGET_ID}/accounts",
+        f"/budgets/{YNAB_BUDGET_ID}/scheduled_transactions",
+        f"/budgets/{YNAB_BUDGET_ID}/categories",
+    )
+
+    balance = get_account_balance(accounts_data)
+    transactions = get_scheduled_transactions(scheduled_data, today, end_date)
+    cc_payments, cc_total = get_cc_payment_amounts(accounts_data, categories_data)
+    min_balance, min_date = project_minimum_balance(balance, transactions, cc_payments, today)
 
+    # The projection works in integer milliunits; convert once for reporting.
+    min_balance = milliunits_to_dollars(min_balance)
     if min_balance < MIN_BALANCE:
         shortfall = MIN_BALANCE - min_balance
         print(f"\n⚠ ALERT: Projected balance drops ${shortfall:,.2f} below threshold!")
-        send_alert_notification(min_balance, min_date)
+        send_alert_notification(alert_notifier, min_balance, min_date)
     else:
         print(f"\n✓ Balance stays above ${MIN_BALANCE:,.2f} threshold.")
 
     if send_update:
-        send_update_notification(min_balance, min_date, end_date)
+        send_update_notification(update_notifier, min_balance, min_date, end_date)
 
 
 # ---------------------------------------------------------------------------
@@ -460,21 +686,24 @@ def _describe_schedule(label, parsed):
 def main():
     validate_config()
 
+    # Build the notifiers once; they are reused on every scheduled run.
+    alert_notifier = _build_notifier(APPRISE_URLS)
+    update_notifier = _build_notifier(UPDATE_APPRISE_URLS or APPRISE_URLS)
+
     schedule = _parse_schedule(SCHEDULE)
     update_schedule = _parse_schedule(UPDATE_SCHEDULE) if UPDATE_SCHEDULE else None
 
     if schedule is None and update_schedule is None:
         # Run once and exit
-        run_check()
+        run_check(alert_notifier, update_notifier)
         return
 
     # Run on a schedule (at least one of check / update is recurring)
-    shutdown = False
+    shutdown = threading.Event()
 
     def handle_signal(signum, frame):
-        nonlocal shutdown
         print("\nShutting down...")
-        shutdown = True
+        shutdown.set()
 
     signal.signal(signal.SIGTERM, handle_signal)
     signal.signal(signal.SIGINT, handle_signal)
@@ -496,30 +725,33 @@ def main():
     else:
         next_update = None
 
-    while not shutdown:
+    while not shutdown.is_set():
         # Sleep until the sooner of the two pending events
         candidates = [t for t in [next_check, next_update] if t is not None]
         if not candidates:
             break
         wake_time = min(candidates)
 
+        # A single wait for the whole interval; a signal sets the event and
+        # wakes it immediately.
         wait = (wake_time - datetime.now()).total_seconds()
         if wait > 0:
             print(f"Next event in {wait / 3600:.4g} hours")
-            while wait > 0 and not shutdown:
-                time.sleep(min(wait, 60))
-                wait -= 60
-
-        if shutdown:
-            break
+            if shutdown.wait(timeout=wait):
+                break
 
         now = datetime.now()
         do_check = next_check is not None and now >= next_check
         do_update = next_update is not None and now >= next_update
+        if not (do_check or do_update):
+            # The wait is measured on the monotonic clock; if the wall clock
+            # lags behind it (clock adjustment, DST change), wait the rest
+            # rather than running early.
+            continue
 
         # Run the projection (always checks alert threshold; optionally sends
         # an update notification when the update schedule fires).
-        run_check(send_update=do_update)
+        run_check(alert_notifier, update_notifier, send_update=do_update)
 
         if do_check and schedule:
             next_check = _next_occurrence(schedule)